@@ -0,0 +1,16 @@
+-- Trigram indexes so the ILIKE '%value%' filters used by search, suggestions
+-- and type browsing can use an index scan instead of a sequential scan.
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS idx_med_name_trgm
+    ON "generic medicines list" USING gin ("Name" gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS idx_med_formulation_trgm
+    ON "generic medicines list" USING gin ("Formulation" gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS idx_med_type_trgm
+    ON "generic medicines list" USING gin ("Type" gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS idx_med_dosage_trgm
+    ON "generic medicines list" USING gin ("Dosage" gin_trgm_ops);
@@ -0,0 +1,14 @@
+-- Store the derived cost columns so they are computed once on write instead
+-- of on every row of every API response.
+
+ALTER TABLE "generic medicines list"
+    ADD COLUMN "Cost difference" numeric
+        GENERATED ALWAYS AS ("Cost of branded" - "Cost of generic") STORED,
+    ADD COLUMN "Savings" numeric
+        GENERATED ALWAYS AS (
+            CASE
+                WHEN "Cost of branded" > 0
+                THEN round(("Cost of branded" - "Cost of generic") / "Cost of branded" * 100, 1)
+                ELSE 0
+            END
+        ) STORED;
@@ -0,0 +1,9 @@
+-- Enforce the price rules the API used to check on every Medicine it built.
+-- Added as NOT VALID so existing rows are not rechecked; run
+-- ALTER TABLE ... VALIDATE CONSTRAINT once any bad rows are fixed.
+
+ALTER TABLE "generic medicines list"
+    ADD CONSTRAINT chk_med_prices_non_negative
+        CHECK ("Cost of branded" >= 0 AND "Cost of generic" >= 0) NOT VALID,
+    ADD CONSTRAINT chk_med_generic_not_above_branded
+        CHECK ("Cost of generic" <= "Cost of branded") NOT VALID;
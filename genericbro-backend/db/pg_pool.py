@@ -0,0 +1,66 @@
+"""
+Postgres connection pool configuration and initialization.
+This module provides a shared asyncpg pool for database operations.
+"""
+
+import os
+from typing import Optional
+from dotenv import load_dotenv
+import asyncpg
+import logging
+
+logger = logging.getLogger(__name__)
+
+class DatabaseConnectionError(Exception):
+    """Custom exception for Postgres connection errors."""
+    pass
+
+_pool: Optional[asyncpg.Pool] = None
+
+async def get_pool() -> asyncpg.Pool:
+    """
+    Returns the shared asyncpg pool, creating it on first use.
+
+    Returns:
+        asyncpg.Pool: A connection pool talking directly to Postgres
+
+    Raises:
+        DatabaseConnectionError: If DATABASE_URL is missing or the pool cannot be created
+    """
+    global _pool
+    if _pool is not None:
+        return _pool
+
+    load_dotenv()
+    database_url: Optional[str] = os.getenv("DATABASE_URL")
+    if not database_url:
+        error_msg = "Missing required environment variable: DATABASE_URL"
+        logger.error(error_msg)
+        raise DatabaseConnectionError(error_msg)
+
+    try:
+        logger.info("Creating Postgres connection pool...")
+        _pool = await asyncpg.create_pool(
+            dsn=database_url,
+            min_size=5,
+            max_size=20,
+            max_inactive_connection_lifetime=300,
+            # PgBouncer in transaction mode cannot keep named prepared
+            # statements alive across transactions
+            statement_cache_size=0,
+        )
+        logger.info("Postgres connection pool created successfully")
+        return _pool
+    except Exception as e:
+        error_msg = f"Failed to create Postgres connection pool: {str(e)}"
+        logger.error(error_msg)
+        raise DatabaseConnectionError(error_msg)
+
+async def close_pool() -> None:
+    """Close the shared pool if it has been created."""
+    global _pool
+    if _pool is not None:
+        await _pool.close()
+        _pool = None
+
+__all__ = ["get_pool", "close_pool", "DatabaseConnectionError"]
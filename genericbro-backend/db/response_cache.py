@@ -0,0 +1,102 @@
+"""
+Redis-backed response cache.
+This module provides a decorator that caches endpoint responses in Redis so
+repeat requests are shared across uvicorn workers without touching Postgres.
+"""
+
+import os
+import functools
+from typing import Any, Awaitable, Callable, Dict, Optional
+from dotenv import load_dotenv
+from fastapi import Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import ORJSONResponse, Response
+import orjson
+import redis.asyncio as redis
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL = 300  # Seconds before a cached response expires
+
+_redis: Optional[redis.Redis] = None
+
+async def init_cache() -> None:
+    """Connect to Redis if REDIS_URL is set; otherwise caching is disabled."""
+    global _redis
+    load_dotenv()
+    redis_url: Optional[str] = os.getenv("REDIS_URL")
+    if not redis_url:
+        logger.warning("REDIS_URL is not set, response caching is disabled")
+        return
+    _redis = redis.from_url(redis_url)
+
+async def close_cache() -> None:
+    """Close the Redis connection if one was opened."""
+    global _redis
+    if _redis is not None:
+        await _redis.aclose()
+        _redis = None
+
+def _cache_key(prefix: str, params: Dict[str, Any]) -> str:
+    """
+    Build a cache key from the endpoint parameters. Parameters are sorted so
+    the order of query string arguments does not matter.
+    """
+    parts = [
+        f"{name}={params[name]!r}"
+        for name in sorted(params)
+        if not isinstance(params[name], Request)
+    ]
+    return f"response:{prefix}:" + "&".join(parts)
+
+def cache_response(ttl_seconds: int = DEFAULT_TTL) -> Callable:
+    """
+    Cache the JSON body of successful responses from an async endpoint.
+
+    Args:
+        ttl_seconds: How long a cached response is served before it expires
+    """
+    def decorator(func: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+        @functools.wraps(func)
+        async def wrapper(**kwargs: Any) -> Any:
+            if _redis is None:
+                return await func(**kwargs)
+
+            key = _cache_key(func.__qualname__, kwargs)
+            try:
+                cached = await _redis.hgetall(key)
+            except Exception as e:
+                logger.warning("Error reading response cache: %s", e)
+                cached = None
+            if cached:
+                return Response(
+                    content=cached[b"body"],
+                    headers=orjson.loads(cached[b"headers"]),
+                    media_type="application/json"
+                )
+
+            result = await func(**kwargs)
+            if not isinstance(result, Response):
+                result = ORJSONResponse(content=jsonable_encoder(result))
+
+            # Streamed responses have no body to store
+            if result.status_code == 200 and hasattr(result, "body"):
+                # Keep custom headers such as pagination cursors with the body
+                custom_headers = {
+                    name: value
+                    for name, value in result.headers.items()
+                    if name.lower().startswith("x-")
+                }
+                try:
+                    async with _redis.pipeline(transaction=True) as pipe:
+                        pipe.hset(key, mapping={"body": result.body, "headers": orjson.dumps(custom_headers)})
+                        pipe.expire(key, ttl_seconds)
+                        await pipe.execute()
+                except Exception as e:
+                    logger.warning("Error writing response cache: %s", e)
+            return result
+        return wrapper
+    return decorator
+
+__all__ = ["init_cache", "close_cache", "cache_response"]
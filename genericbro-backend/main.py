@@ -1,15 +1,69 @@
-from fastapi import FastAPI
+import asyncio
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.routing import APIRoute
+import os
 import sys
 from pathlib import Path
+import logging
+from db.pg_pool import get_pool, close_pool
+from db.response_cache import init_cache, close_cache
 from routers import finder
 
+# Request-level logs are DEBUG/INFO; keep them off unless LOG_LEVEL asks for them
+logging.basicConfig(
+    level=os.getenv("LOG_LEVEL", "WARNING").upper(),
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
+logger = logging.getLogger(__name__)
+
+DB_STARTUP_ATTEMPTS = 5  # Times to try reaching the database before giving up
+DB_PING_TIMEOUT = 5  # Seconds to wait for each attempt
+
+async def _ping_db() -> None:
+    """Create the pool if needed and round-trip one pooled connection."""
+    pool = await get_pool()
+    async with pool.acquire() as connection:
+        await connection.fetchval("SELECT 1")
+
+async def _wait_for_db() -> None:
+    """Ping the database, retrying with exponential backoff."""
+    delay = 0.5
+    for attempt in range(1, DB_STARTUP_ATTEMPTS + 1):
+        try:
+            await asyncio.wait_for(_ping_db(), DB_PING_TIMEOUT)
+            return
+        except Exception as e:
+            if attempt == DB_STARTUP_ATTEMPTS:
+                logger.error("Database unreachable after %d attempts: %s", attempt, e)
+                raise
+            logger.warning("Database not ready (attempt %d/%d): %s", attempt, DB_STARTUP_ATTEMPTS, e)
+            await asyncio.sleep(delay)
+            delay *= 2
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Wait for the database, warm the shared pool and load reference data on startup."""
+    await _wait_for_db()
+    app.state.pool = await get_pool()
+    await init_cache()
+    # Warm the cached list of medicine types
+    await finder.get_all_types()
+    yield
+    await close_cache()
+    await close_pool()
+
 # Create FastAPI app
 app = FastAPI(
     title="GenericBro API",
     description="Backend API for GenericBro application",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 # Configure CORS
@@ -19,8 +73,32 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
+# Compress larger responses, including streamed NDJSON
+app.add_middleware(GZipMiddleware, minimum_size=1000)
+
+# Read-only reference data endpoints that browsers and CDNs may cache
+CACHED_PATH_PREFIXES = (
+    "/finder/suggestions/",
+    "/finder/medicine/",
+    "/finder/medicines/by_type",
+)
+CACHE_MAX_AGE = 60  # Seconds downstream caches may reuse a response
+
+@app.middleware("http")
+async def add_cache_control(request: Request, call_next):
+    """Add Cache-Control headers to successful GETs of reference data."""
+    response = await call_next(request)
+    if (
+        request.method == "GET"
+        and response.status_code == 200
+        and request.url.path.startswith(CACHED_PATH_PREFIXES)
+    ):
+        response.headers.setdefault("Cache-Control", f"public, max-age={CACHE_MAX_AGE}")
+    return response
+
 # Include routers - removing the /api prefix for simplicity
 app.include_router(finder.router, prefix="/finder", tags=["finder"])
 
@@ -43,4 +121,10 @@ def get_routes():
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # Multiple workers need the app passed as an import string
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=8000,
+        workers=int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 1))
+    )
@@ -2,9 +2,9 @@
 Pydantic models for request and response data validation.
 """
 
-from pydantic import BaseModel, Field, validator, ConfigDict
+from pydantic import BaseModel, Field, validator, field_validator, computed_field, ConfigDict
 from typing import Optional, List, Dict, Any
-from decimal import Decimal
+from decimal import Decimal, ROUND_HALF_UP
 
 class MedicineSearchRequest(BaseModel):
     """
@@ -50,50 +50,32 @@ class Medicine(BaseModel):
     formulation: str = Field(..., alias="Formulation", description="Medicine formulation (e.g., Glimepiride 1mg)")
     cost_of_branded: Decimal = Field(..., alias="Cost of branded", description="Price of branded version")
     cost_of_generic: Decimal = Field(..., alias="Cost of generic", description="Price of generic version")
-    cost_difference: Optional[Decimal] = Field(None, alias="Cost difference", description="Difference between branded and generic cost")
-    savings: Optional[float] = Field(None, alias="Savings", description="Percentage savings when choosing generic over branded")
     type: str = Field(..., alias="Type", description="Type of medicine (e.g., A-Anti Diabetic)")
-    uses: str = Field(..., alias="Uses", description="Uses and indications")
-    side_effects: str = Field(..., alias="Side Effects", description="Known side effects")
+    uses: Optional[str] = Field(None, alias="Uses", description="Uses and indications (only included in medicine details)")
+    side_effects: Optional[str] = Field(None, alias="Side Effects", description="Known side effects (only included in medicine details)")
 
-    @validator('cost_of_branded', 'cost_of_generic')
+    @field_validator('cost_of_branded', 'cost_of_generic')
+    @classmethod
     def validate_prices(cls, v):
         """Ensure prices are not negative"""
         if v is not None and v < 0:
             raise ValueError("Price cannot be negative")
         return v
 
-    @validator('cost_of_generic')
-    def validate_generic_price(cls, v, values):
-        """Ensure generic price is not higher than branded price"""
-        if v is not None and 'cost_of_branded' in values:
-            branded_price = values['cost_of_branded']
-            if v > branded_price:
-                raise ValueError("Generic price cannot be higher than branded price")
-        return v
-
-    @validator('cost_difference')
-    def calculate_cost_difference(cls, v, values):
-        """Calculate and validate cost difference"""
-        if 'cost_of_branded' in values and 'cost_of_generic' in values:
-            branded_price = values['cost_of_branded']
-            generic_price = values['cost_of_generic']
-            calculated_difference = branded_price - generic_price
-            if calculated_difference < 0:
-                raise ValueError("Cost difference cannot be negative (branded price must be higher than or equal to generic price)")
-            return calculated_difference
-        return v
-
-    @validator('savings')
-    def calculate_savings(cls, v, values):
-        """Calculate savings percentage"""
-        if 'cost_of_branded' in values and 'cost_of_generic' in values:
-            branded_price = float(values['cost_of_branded'])
-            generic_price = float(values['cost_of_generic'])
-            if branded_price > 0:
-                savings = ((branded_price - generic_price) / branded_price) * 100
-                return round(savings, 1)
-        return v
+    @computed_field(alias="Cost difference", description="Difference between branded and generic cost")
+    @property
+    def cost_difference(self) -> Decimal:
+        return self.cost_of_branded - self.cost_of_generic
+
+    @computed_field(alias="Savings", description="Percentage savings when choosing generic over branded")
+    @property
+    def savings(self) -> float:
+        # Round half away from zero like Postgres round(numeric, 1) does for
+        # the stored "Savings" column, rather than float rounding
+        if self.cost_of_branded > 0:
+            percent = self.cost_difference / self.cost_of_branded * 100
+            return float(percent.quantize(Decimal("0.1"), rounding=ROUND_HALF_UP))
+        return 0.0
 
     model_config = ConfigDict(
         populate_by_name=True,
@@ -111,6 +93,7 @@ class SearchResponse(BaseModel):
     )
     Uses: Optional[str] = Field(None, description="Uses of the exact match medicine")
     Side_Effects: Optional[str] = Field(None, description="Side effects of the exact match medicine")
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page of similar formulations, if any")
 
     model_config = ConfigDict(populate_by_name=True)
 
@@ -1,7 +1,11 @@
 from fastapi import APIRouter, HTTPException, Query, status
-from typing import List, Optional, Dict, Any, Literal
+from typing import AsyncIterator, List, Optional, Dict, Any, Literal
 import os
-from db.supabase_client import supabase, SupabaseConnectionError
+import re
+import base64
+from types import MappingProxyType
+from db.pg_pool import get_pool, DatabaseConnectionError
+from db.response_cache import cache_response
 from models.schemas import (
     MedicineSearchRequest,
     Medicine,
@@ -9,89 +13,126 @@ from models.schemas import (
     AutocompleteSuggestion,
     AutocompleteResponse
 )
-from decimal import Decimal
-from functools import lru_cache
-from fastapi.responses import JSONResponse
+from decimal import Decimal, InvalidOperation
+from async_lru import alru_cache
+from fastapi.responses import JSONResponse, ORJSONResponse, StreamingResponse
+import asyncpg
+import orjson
 import logging
 import traceback
 
 # Set up logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+class RecordJSONResponse(ORJSONResponse):
+    """ORJSONResponse that also handles the Decimal values asyncpg returns for numeric columns."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=str)
+
 # Define the table name as a constant
 MEDICINES_TABLE = 'generic medicines list'
 MAX_RESULTS = 15  # Maximum number of results to return
+MAX_PAGE_SIZE = 50  # Largest page a client may request from search
+
+# Columns loaded into Medicine for listings, and for a single medicine's
+# details. Medicine computes cost difference and savings itself
+MEDICINE_COLS = '"Name","Dosage","Formulation","Cost of branded","Cost of generic","Type"'
+MEDICINE_COLS_FULL = MEDICINE_COLS + ',"Uses","Side Effects"'
+# Columns for rows serialized as-is, with the stored derived columns.
+# Savings is a float everywhere else in the API, so it is cast rather than
+# left as a numeric that raw row serialization would turn into a string
+MEDICINE_ROW_COLS = (
+    '"Name","Dosage","Formulation","Cost of branded","Cost of generic","Cost difference",'
+    '"Savings"::float8 AS "Savings","Type"'
+)
+
+# Map the field names to database column names
+_FIELD_MAP = MappingProxyType({
+    "type": "Type",
+    "name": "Name",
+    "formulation": "Formulation",
+    "dosage": "Dosage",
+    # Add the capitalized versions too for backward compatibility
+    "Type": "Type",
+    "Name": "Name",
+    "Formulation": "Formulation",
+    "Dosage": "Dosage"
+})
+# Columns that can be searched and suggested
+_VALID_FIELDS = frozenset({"Name", "Formulation", "Type", "Dosage"})
+# Columns that together identify a medicine; a name alone comes in several dosages
+_KEYSET_FIELDS = ("Name", "Dosage", "Formulation")
+# Stand-ins for NULL keyset values, since a row comparison with a NULL is
+# never true. Prices are never negative, so -1 sorts NULL prices first
+_NULL_TEXT_KEY = ""
+_NULL_PRICE_KEY = Decimal(-1)
+
+MAX_SUGGESTIONS = 10  # Maximum number of autocomplete suggestions to return
+SUGGESTIONS_CACHE_TTL = 300  # Seconds before cached suggestions expire
+TYPES_CACHE_TTL = 3600  # Seconds before the cached list of types expires
+RESPONSE_CACHE_TTL = 600  # Seconds Redis serves a cached endpoint response
+
+# Patterns used to normalize user-entered search values
+_WS_RE = re.compile(r"\s+")
+_HYPHEN_RE = re.compile(r"\s*-\s*")
 
 def clean_search_value(value: str) -> str:
     """Clean and standardize search value."""
     if not value:
         return ""
-    # Remove any leading/trailing whitespace
-    cleaned = value.strip()
-    # Remove any extra spaces around hyphens
-    cleaned = "-".join(part.strip() for part in cleaned.split("-"))
-    # Remove any quotes that might interfere with the query
-    cleaned = cleaned.replace("'", "''")
-    return cleaned
+    # Collapse whitespace, then remove any spaces around hyphens
+    return _HYPHEN_RE.sub("-", _WS_RE.sub(" ", value).strip())
 
 def clean_type_value(value: str) -> str:
     """Clean and standardize type value."""
     if not value:
         return ""
     
-    # Debug: Log the raw input value
-    logger.info(f"Raw type value: {repr(value)}")
-    
     # Basic cleaning: remove extra whitespace
-    cleaned = " ".join(value.split())
-    logger.info(f"After basic cleaning: {repr(cleaned)}")
+    cleaned = _WS_RE.sub(" ", value).strip()
+    logger.debug("Cleaned type value: %r -> %r", value, cleaned)
     
     return cleaned
 
-def build_search_query(table_query, field: str, value: str, exact: bool = False) -> Any:
-    """Build a search query for a field."""
+def build_search_query(conditions: List[str], args: List[Any], field: str, value: str, exact: bool = False) -> None:
+    """Add a parameterized WHERE condition for a field to the query being built."""
     if not value:
-        return table_query
-    
-    # Map the field names to database column names
-    field_mapping = {
-        "type": "Type",
-        "name": "Name",
-        "formulation": "Formulation",
-        "dosage": "Dosage",
-        # Add the capitalized versions too for backward compatibility
-        "Type": "Type",
-        "Name": "Name",
-        "Formulation": "Formulation",
-        "Dosage": "Dosage"
-    }
+        return
     
-    db_field = field_mapping.get(field)
+    db_field = _FIELD_MAP.get(field)
     if not db_field:
-        logger.error(f"Unknown field: {field}")
-        return table_query
+        logger.error("Unknown field: %s", field)
+        return
     
     if db_field == "Type":
         cleaned_value = clean_type_value(value)
         if not cleaned_value:
-            return table_query
-            
-        logger.info(f"Building type search query for: {repr(cleaned_value)}")
-        logger.info(f"Using database field: {db_field}")
+            return
         
         # Simple case-insensitive search
-        return table_query.ilike(db_field, f"%{cleaned_value}%")
+        args.append(f"%{cleaned_value}%")
+        conditions.append(f'"{db_field}" ILIKE ${len(args)}')
+        return
     
     cleaned_value = clean_search_value(value)
     if not cleaned_value:
-        return table_query
+        return
     
     if exact:
-        return table_query.eq(db_field, cleaned_value)
-    return table_query.ilike(db_field, f"%{cleaned_value}%")
+        args.append(cleaned_value)
+        conditions.append(f'"{db_field}" = ${len(args)}')
+    else:
+        args.append(f"%{cleaned_value}%")
+        conditions.append(f'"{db_field}" ILIKE ${len(args)}')
+
+def build_where_clause(conditions: List[str]) -> str:
+    """Join the collected conditions into a WHERE clause."""
+    if not conditions:
+        return ""
+    return " WHERE " + " AND ".join(conditions)
 
 def safe_get(data: Optional[Dict[str, Any]], key: str, default: Any = None) -> Any:
     """Safely get a value from a dictionary that might be None."""
@@ -99,64 +140,124 @@ def safe_get(data: Optional[Dict[str, Any]], key: str, default: Any = None) -> A
         return default
     return data.get(key, default)
 
-def apply_price_sort(query, sort_order: Optional[str] = None) -> Any:
-    """Apply price sorting to the query based on branded medicine price."""
+def apply_price_sort(sort_order: Optional[str] = None) -> Optional[str]:
+    """Get the ORDER BY term for sorting by branded medicine price."""
     if sort_order == "low_to_high":
-        return query.order("Cost of branded", desc=False)
+        return '"Cost of branded" ASC'
     elif sort_order == "high_to_low":
-        return query.order("Cost of branded", desc=True)
-    return query
+        return '"Cost of branded" DESC'
+    return None
+
+def build_order_clause(order_terms: List[str]) -> str:
+    """Join the collected sort terms into an ORDER BY clause."""
+    if not order_terms:
+        return ""
+    return " ORDER BY " + ", ".join(order_terms)
+
+def encode_cursor(row: Dict[str, Any], sort_order: Optional[str] = None) -> str:
+    """Build an opaque cursor pointing just after the given row. NULLs are kept as null."""
+    key = [row[field] for field in _KEYSET_FIELDS]
+    if apply_price_sort(sort_order) is not None:
+        cost = row["Cost of branded"]
+        key.insert(0, None if cost is None else str(cost))
+    return base64.urlsafe_b64encode(orjson.dumps(key)).decode()
+
+def decode_cursor(cursor: str, sort_order: Optional[str] = None) -> List[Any]:
+    """Decode a cursor built by encode_cursor for the same sort order."""
+    try:
+        key = orjson.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if not isinstance(key, list):
+            raise ValueError("Cursor is not a list")
+        values: List[Any] = []
+        if apply_price_sort(sort_order) is not None:
+            cost, *key = key
+            values.append(_NULL_PRICE_KEY if cost is None else Decimal(cost))
+        if len(key) != len(_KEYSET_FIELDS):
+            raise ValueError("Cursor has the wrong number of fields")
+        return values + [_NULL_TEXT_KEY if value is None else str(value) for value in key]
+    except (ValueError, TypeError, InvalidOperation):
+        raise ValueError("Invalid cursor")
+
+def apply_keyset(conditions: List[str], args: List[Any], sort_order: Optional[str] = None, cursor: Optional[str] = None) -> List[str]:
+    """
+    Add the keyset condition for the cursor (if any) and return the matching
+    ORDER BY terms. Name, Dosage and Formulation together identify a row, so
+    ties on price or name never make pages skip or overlap. Keys are
+    COALESCE'd in both places so rows with NULL keys are paged like any other.
+    """
+    key_columns = [f"COALESCE(\"{field}\", '{_NULL_TEXT_KEY}')" for field in _KEYSET_FIELDS]
+    if apply_price_sort(sort_order) is not None:
+        key_columns.insert(0, f'COALESCE("Cost of branded", {_NULL_PRICE_KEY})')
+    direction = "DESC" if sort_order == "high_to_low" else "ASC"
+
+    if cursor:
+        first_param = len(args) + 1
+        args.extend(decode_cursor(cursor, sort_order))
+        placeholders = ", ".join(f"${i}" for i in range(first_param, len(args) + 1))
+        operator = "<" if direction == "DESC" else ">"
+        conditions.append(f'({", ".join(key_columns)}) {operator} ({placeholders})')
+    return [f"{column} {direction}" for column in key_columns]
 
 # Cache for suggestions
-@lru_cache(maxsize=1000)
-def get_cached_suggestions(field: str, query: Optional[str] = None) -> List[str]:
+@alru_cache(maxsize=1000, ttl=SUGGESTIONS_CACHE_TTL)
+async def get_cached_suggestions(field: str, query: Optional[str] = None) -> List[str]:
     """Cache suggestions to reduce database load"""
+    # The column name is interpolated into the SQL, so it must be whitelisted
+    if field not in _VALID_FIELDS:
+        raise ValueError(f"Invalid suggestion field: {field}")
     try:
-        table_query = supabase.table(MEDICINES_TABLE).select(field)
+        pool = await get_pool()
+        conditions = [f'"{field}" IS NOT NULL']
+        args: List[Any] = []
         
         if query:
             cleaned_query = clean_search_value(query)
-            table_query = table_query.ilike(field, f"%{cleaned_query}%")
-        
-        response = table_query.execute()
+            args.append(f"%{cleaned_query}%")
+            conditions.append(f'"{field}" ILIKE ${len(args)}')
         
-        if not response.data:
-            return []
-            
-        suggestions = set()
-        for item in response.data:
-            value = item.get(field)
-            if value and isinstance(value, str):
-                suggestions.add(value)
+        args.append(MAX_SUGGESTIONS)
+        sql = (
+            f'SELECT DISTINCT "{field}" FROM "{MEDICINES_TABLE}"'
+            + build_where_clause(conditions)
+            + f' ORDER BY "{field}" LIMIT ${len(args)}'
+        )
+        rows = await pool.fetch(sql, *args)
         
-        return sorted(list(suggestions))[:10]  # Limit to 10 suggestions
+        return [row[field] for row in rows if row[field] and isinstance(row[field], str)]
+    except DatabaseConnectionError:
+        raise
     except Exception as e:
         logger.error(f"Error in get_cached_suggestions: {str(e)}")
         logger.error(traceback.format_exc())
         return []  # Return empty list instead of raising error
 
-def create_medicine_from_db(data: Dict[str, Any]) -> Medicine:
-    """Create a Medicine instance from database data with proper cost calculations."""
+async def stream_medicines_ndjson(rows: List[asyncpg.Record], limit: int, sort_order: Optional[str] = None) -> AsyncIterator[bytes]:
+    """
+    Stream already fetched rows as NDJSON, one medicine per line. If the page
+    is full, a final {"next_cursor": ...} line points at the next page.
+
+    The rows are fetched before the response starts (a server-side cursor
+    needs a named prepared statement, which PgBouncer in transaction mode
+    does not keep), so database errors still become a 500. Anything failing
+    after the headers are sent ends the stream with an {"error": ...} line.
+    """
     try:
-        # Ensure cost fields are Decimal
-        if "Cost of branded" in data:
-            data["Cost of branded"] = Decimal(str(data["Cost of branded"]))
-        if "Cost of generic" in data:
-            data["Cost of generic"] = Decimal(str(data["Cost of generic"]))
-        
-        # Calculate cost difference if not present
-        if "Cost difference" not in data or data["Cost difference"] is None:
-            if "Cost of branded" in data and "Cost of generic" in data:
-                data["Cost difference"] = data["Cost of branded"] - data["Cost of generic"]
-        
-        # Calculate savings if not present
-        if "Savings" not in data or data["Savings"] is None:
-            if "Cost of branded" in data and "Cost of generic" in data:
-                branded_price = float(data["Cost of branded"])
-                generic_price = float(data["Cost of generic"])
-                if branded_price > 0:
-                    data["Savings"] = round(((branded_price - generic_price) / branded_price) * 100, 1)
+        for row in rows:
+            yield orjson.dumps(dict(row), default=str) + b"\n"
+        if len(rows) == limit:
+            yield orjson.dumps({"next_cursor": encode_cursor(rows[-1], sort_order)}) + b"\n"
+    except Exception as e:
+        logger.error(f"Error streaming medicines: {str(e)}")
+        logger.error(traceback.format_exc())
+        yield orjson.dumps({"error": "Stream ended early"}) + b"\n"
+
+def create_medicine_from_db(data: Dict[str, Any]) -> Medicine:
+    """Create a Medicine instance from database data.
 
+    asyncpg already decodes numeric columns to Decimal, and cost difference
+    and savings are computed fields on Medicine, so the row is validated as-is.
+    """
+    try:
         return Medicine.model_validate(data)
     except Exception as e:
         logger.error(f"Error creating Medicine from data: {data}")
@@ -164,22 +265,25 @@ def create_medicine_from_db(data: Dict[str, Any]) -> Medicine:
         logger.error(traceback.format_exc())
         raise
 
-def get_all_types() -> List[str]:
+@alru_cache(maxsize=1, ttl=TYPES_CACHE_TTL)
+async def load_all_types() -> List[str]:
+    """Load all unique types from the database. Cached so it rarely runs."""
+    pool = await get_pool()
+    rows = await pool.fetch(
+        f'SELECT DISTINCT "Type" FROM "{MEDICINES_TABLE}" WHERE "Type" IS NOT NULL ORDER BY "Type"'
+    )
+    return [row["Type"] for row in rows]
+
+async def get_all_types() -> List[str]:
     """Get all unique types from the database for debugging."""
     try:
-        response = supabase.table(MEDICINES_TABLE) \
-            .select('Type') \
-            .execute()
-        types = set()
-        for item in response.data:
-            if item.get('Type'):
-                types.add(item['Type'])
-        return sorted(list(types))
+        return await load_all_types()
     except Exception as e:
         logger.error(f"Error getting all types: {str(e)}")
         return []
 
 @router.get("/suggestions/{field}", response_model=AutocompleteResponse)
+@cache_response(ttl_seconds=RESPONSE_CACHE_TTL)
 async def get_suggestions(
     field: str,
     query: Optional[str] = Query(default=None, min_length=0),
@@ -187,21 +291,19 @@ async def get_suggestions(
     """Get suggestions for autocomplete dropdowns."""
     try:
         # Validate field
-        valid_fields = ["Name", "Formulation", "Type", "Dosage"]
-        if field not in valid_fields:
+        if field not in _VALID_FIELDS:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Invalid field. Must be one of: {', '.join(valid_fields)}"
+                detail=f"Invalid field. Must be one of: {', '.join(sorted(_VALID_FIELDS))}"
             )
 
         # Get suggestions from cache
-        suggestions = get_cached_suggestions(field, query)
-        logger.info(f"Got {len(suggestions)} suggestions for {field} with query: {query}")
+        suggestions = await get_cached_suggestions(field, query)
+        logger.debug("Got %d suggestions for %s with query: %r", len(suggestions), field, query)
 
         # If getting type suggestions, log all available types for debugging
-        if field == "Type":
-            all_types = get_all_types()
-            logger.info(f"All available types in database: {all_types}")
+        if field == "Type" and logger.isEnabledFor(logging.DEBUG):
+            logger.debug("All available types in database: %s", await get_all_types())
 
         return AutocompleteResponse(
             suggestions=[
@@ -210,8 +312,8 @@ async def get_suggestions(
             ]
         )
 
-    except SupabaseConnectionError:
-        logger.error("Supabase connection error in get_suggestions")
+    except DatabaseConnectionError:
+        logger.error("Database connection error in get_suggestions")
         return JSONResponse(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             content={"detail": "Database connection error. Please try again later."}
@@ -227,80 +329,108 @@ async def get_suggestions(
 @router.post("/search", response_model=SearchResponse)
 async def search_medicines(
     search_request: MedicineSearchRequest,
-    sort_order: Optional[Literal["none", "low_to_high", "high_to_low"]] = None
+    sort_order: Optional[Literal["none", "low_to_high", "high_to_low"]] = None,
+    limit: int = Query(default=MAX_RESULTS, ge=1, le=MAX_PAGE_SIZE, description="Maximum number of similar formulations to return"),
+    cursor: Optional[str] = Query(default=None, description="next_cursor from the previous page")
 ):
-    """Search for medicines with flexible filters and optional price sorting."""
+    """
+    Search for medicines with flexible filters and optional price sorting.
+    Similar formulations are paginated with a keyset cursor; the exact match
+    is only returned on the first page.
+    """
     try:
-        # Detailed request logging
-        logger.info("=== New Search Request ===")
-        logger.info(f"Full request object: {search_request}")
-        logger.info(f"Raw request dict: {search_request.model_dump()}")
-        
-        if search_request.type:
-            logger.info("=== Type Field Details ===")
-            logger.info(f"Raw type value: {repr(search_request.type)}")
-            logger.info(f"Type value length: {len(search_request.type)}")
-            logger.info(f"Type value bytes: {[ord(c) for c in search_request.type]}")
-            logger.info(f"Type value after strip: {repr(search_request.type.strip())}")
-        
-        logger.info(f"Name filter: {repr(search_request.name) if search_request.name else 'None'}")
-        logger.info(f"Formulation filter: {repr(search_request.formulation) if search_request.formulation else 'None'}")
-        logger.info(f"Dosage filter: {repr(search_request.dosage) if search_request.dosage else 'None'}")
-        logger.info(f"Sort order: {repr(sort_order)}")
-        
-        # Get all available types for debugging
-        all_types = get_all_types()
-        logger.info(f"Available types in database: {all_types}")
+        logger.debug(
+            "Search request: name=%r formulation=%r type=%r dosage=%r sort_order=%r cursor=%r",
+            search_request.name,
+            search_request.formulation,
+            search_request.type,
+            search_request.dosage,
+            sort_order,
+            cursor
+        )
         
         # Build the query
-        query = supabase.table(MEDICINES_TABLE).select("*")
-        logger.info("Created initial query")
-
-        # Track if we're doing a type or dosage search
-        is_type_or_dosage_search = (search_request.type or search_request.dosage) and not (search_request.name or search_request.formulation)
+        pool = await get_pool()
+        conditions: List[str] = []
+        args: List[Any] = []
 
         try:
             if search_request.type:
-                # Log the type search details
-                logger.info("=== Type Search Details ===")
-                logger.info(f"Original type value: {repr(search_request.type)}")
-                cleaned_type = clean_type_value(search_request.type)
-                logger.info(f"Cleaned type value: {repr(cleaned_type)}")
-                
-                # Build and log the type query
-                query = build_search_query(query, "type", search_request.type)
-                logger.info("Added type filter to query")
+                build_search_query(conditions, args, "type", search_request.type)
             
             if search_request.formulation:
-                query = build_search_query(query, "formulation", search_request.formulation)
-                logger.info(f"Added formulation filter")
+                build_search_query(conditions, args, "formulation", search_request.formulation)
             
             if search_request.name:
-                query = build_search_query(query, "name", search_request.name)
-                logger.info(f"Added name filter")
+                build_search_query(conditions, args, "name", search_request.name)
             
             if search_request.dosage:
-                query = build_search_query(query, "dosage", search_request.dosage)
-                logger.info(f"Added dosage filter")
+                build_search_query(conditions, args, "dosage", search_request.dosage)
 
-            # Add sorting if specified
-            if sort_order and sort_order != "none":
-                query = query.order("Cost of branded", desc=(sort_order == "high_to_low"))
-                logger.info(f"Added price sorting: {sort_order}")
+            # Add sorting and the position of the requested page. The page
+            # position applies to similar formulations only, never to the
+            # exact match
+            page_conditions: List[str] = []
+            try:
+                order_terms = apply_keyset(page_conditions, args, sort_order, cursor)
+            except ValueError as e:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
-            # Add limit for type/dosage searches
-            if is_type_or_dosage_search:
-                query = query.limit(MAX_RESULTS)
-                logger.info(f"Added limit of {MAX_RESULTS} for type/dosage search")
+            # Match exactly by name, otherwise by formulation
+            exact_field: Optional[str] = None
+            exact_value: Optional[str] = None
+            if search_request.name:
+                exact_field, exact_value = "Name", clean_search_value(search_request.name)
+            elif search_request.formulation:
+                exact_field, exact_value = "Formulation", clean_search_value(search_request.formulation)
+
+            order_clause = build_order_clause(order_terms)
+            if exact_field is None:
+                # Type or dosage searches (or no filters at all) have no exact match
+                args.append(limit)
+                sql = (
+                    f'SELECT {MEDICINE_COLS}, FALSE AS is_exact FROM "{MEDICINES_TABLE}"'
+                    f'{build_where_clause(conditions + page_conditions)}{order_clause} LIMIT ${len(args)}'
+                )
+            else:
+                # Fetch the exact match (with its long text columns) and the
+                # similar formulations (without them) in one round-trip. Later
+                # pages still look up the exact match so it stays excluded
+                # from the similar formulations, but only return the latter.
+                # The exact match is the first matching row in the requested
+                # order, and the page keeps keyset order so the cursor is
+                # taken from its last similar row
+                args.append(exact_value)
+                exact_where_clause = build_where_clause(
+                    conditions + [f'lower("{exact_field}") = lower(${len(args)})']
+                )
+                similar_where_clause = build_where_clause(
+                    conditions + page_conditions + [
+                        'NOT EXISTS (SELECT 1 FROM exact WHERE exact."Name" IS NOT DISTINCT FROM m."Name"'
+                        ' AND exact."Dosage" IS NOT DISTINCT FROM m."Dosage"'
+                        ' AND exact."Formulation" IS NOT DISTINCT FROM m."Formulation")'
+                    ]
+                )
+                args.append(limit)
+                sql = (
+                    f'WITH exact AS ('
+                    f'SELECT {MEDICINE_COLS_FULL}, TRUE AS is_exact FROM "{MEDICINES_TABLE}"'
+                    f'{exact_where_clause}{order_clause} LIMIT 1'
+                    f'), similar_rows AS ('
+                    f'SELECT {MEDICINE_COLS}, NULL::text AS "Uses", NULL::text AS "Side Effects", FALSE AS is_exact'
+                    f' FROM "{MEDICINES_TABLE}" AS m{similar_where_clause}{order_clause} LIMIT ${len(args)}'
+                    f') '
+                    + ('SELECT * FROM similar_rows' if cursor else
+                       'SELECT * FROM (SELECT * FROM exact UNION ALL SELECT * FROM similar_rows) AS page')
+                    + build_order_clause(["is_exact DESC"] + order_terms)
+                )
 
             # Execute query and log the SQL
-            logger.info("=== Executing Query ===")
-            response = query.execute()
-            logger.info(f"Query executed successfully")
-            logger.info(f"Number of results: {len(response.data if response.data else [])}")
+            logger.debug("Executing search SQL: %s", sql)
+            rows = await pool.fetch(sql, *args)
+            logger.debug("Number of results: %d", len(rows))
 
-            if not response.data:
-                logger.info("No medicines found")
+            if not rows:
                 return SearchResponse(
                     exact_match=None,
                     similar_formulations=[],
@@ -308,44 +438,25 @@ async def search_medicines(
                     Side_Effects=None
                 )
             
-            medicines = response.data
-            logger.info(f"Found {len(medicines)} medicines")
+            medicines = [dict(row) for row in rows]
 
-            # For type or dosage searches, return all results as similar formulations
-            if is_type_or_dosage_search:
-                logger.info("Processing type/dosage search results")
-                processed_medicines = [create_medicine_from_db(m) for m in medicines]
-                return SearchResponse(
-                    exact_match=None,
-                    similar_formulations=processed_medicines,
-                    Uses=None,
-                    Side_Effects=None
-                )
-
-            # Handle name/formulation searches
+            # Separate the exact match from similar formulations
             exact_match_medicine: Optional[Medicine] = None
             exact_match_data: Optional[Dict[str, Any]] = None
             
-            # Process exact matches and similar formulations
-            if search_request.name:
-                exact_matches = [m for m in medicines if m["Name"].lower() == search_request.name.lower()]
-                if exact_matches:
-                    exact_match_data = exact_matches[0]
-                    if exact_match_data and "Name" in exact_match_data:
-                        logger.info(f"Found exact match by name: {exact_match_data['Name']}")
-            elif search_request.formulation:
-                exact_matches = [m for m in medicines if m["Formulation"].lower() == search_request.formulation.lower()]
-                if exact_matches:
-                    exact_match_data = exact_matches[0]
-                    if exact_match_data and "Formulation" in exact_match_data:
-                        logger.info(f"Found exact match by formulation: {exact_match_data['Formulation']}")
+            similar_medicines: List[Dict[str, Any]] = []
+            for m in medicines:
+                if m.pop("is_exact"):
+                    exact_match_data = m
+                    logger.debug("Found exact match by %s: %s", exact_field, m[exact_field])
+                else:
+                    similar_medicines.append(m)
 
             # Convert data to Medicine objects
             try:
                 if exact_match_data:
                     exact_match_medicine = create_medicine_from_db(exact_match_data)
-                processed_medicines = [create_medicine_from_db(m) for m in medicines if m != exact_match_data]
-                logger.info(f"Processed {len(processed_medicines)} medicines")
+                processed_medicines = [create_medicine_from_db(m) for m in similar_medicines]
             except Exception as e:
                 logger.error(f"Error converting medicines data: {str(e)}")
                 logger.error(traceback.format_exc())
@@ -354,13 +465,21 @@ async def search_medicines(
                     detail=f"Error processing search results: {str(e)}"
                 )
 
+            # A full page means there may be more similar formulations
+            next_cursor: Optional[str] = None
+            if len(similar_medicines) == limit:
+                next_cursor = encode_cursor(similar_medicines[-1], sort_order)
+
             return SearchResponse(
                 exact_match=exact_match_medicine,
                 similar_formulations=processed_medicines,
                 Uses=safe_get(exact_match_data, "Uses"),
-                Side_Effects=safe_get(exact_match_data, "Side Effects")
+                Side_Effects=safe_get(exact_match_data, "Side Effects"),
+                next_cursor=next_cursor
             )
 
+        except HTTPException:
+            raise
         except Exception as e:
             logger.error("=== Error in Search Process ===")
             logger.error(f"Error details: {str(e)}")
@@ -370,6 +489,8 @@ async def search_medicines(
                 detail=f"Error processing search: {str(e)}"
             )
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error("=== Unexpected Error ===")
         logger.error(f"Error details: {str(e)}")
@@ -385,82 +506,91 @@ async def get_medicine_details(name: str):
     Get detailed information about a specific medicine by name.
     """
     try:
-        response = supabase.table(MEDICINES_TABLE) \
-            .select("*") \
-            .eq("Name", name) \
-            .limit(1) \
-            .execute()
+        pool = await get_pool()
+        row = await pool.fetchrow(
+            f'SELECT {MEDICINE_COLS_FULL} FROM "{MEDICINES_TABLE}" WHERE "Name" = $1 LIMIT 1',
+            name
+        )
 
-        if not response.data:
+        if row is None:
             raise HTTPException(status_code=404, detail="Medicine not found")
 
-        medicine = response.data[0]
-        return Medicine.model_validate(medicine)
+        return Medicine.model_validate(dict(row))
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/medicines/by_type", response_model=List[Medicine])
+@cache_response(ttl_seconds=RESPONSE_CACHE_TTL)
 async def get_medicines_by_type(
     type: str = Query(..., description="Medicine type to filter by"),
     limit: int = Query(default=50, ge=1, le=100, description="Maximum number of results to return"),
     sort_order: Optional[Literal["none", "low_to_high", "high_to_low"]] = Query(
         default="none",
         description="Sort order for medicine prices"
+    ),
+    cursor: Optional[str] = Query(default=None, description="X-Next-Cursor header from the previous page"),
+    format: Literal["json", "ndjson"] = Query(
+        default="json",
+        description="Return a JSON array, or stream one JSON object per line"
     )
 ):
     """
     Get medicines by type with a simple, focused query.
     This endpoint is optimized for type-based browsing and filtering.
+    When more results are available the X-Next-Cursor header holds the
+    cursor for the next page. With format=ndjson rows are streamed one per
+    line and the cursor is sent as a final {"next_cursor": ...} line.
     """
     try:
-        logger.info("=== Medicine Type Filter Request ===")
-        logger.info(f"Requested type: {repr(type)}")
-        logger.info(f"Sort order: {sort_order}")
+        logger.debug("Type filter request: type=%r sort_order=%r cursor=%r", type, sort_order, cursor)
         
         # Clean and validate the type
         cleaned_type = clean_type_value(type)
-        logger.info(f"Cleaned type: {repr(cleaned_type)}")
-        
-        # Get all available types for comparison
-        all_types = get_all_types()
-        logger.info(f"Available types: {all_types}")
         
         # Build a simple query
-        query = (
-            supabase.table(MEDICINES_TABLE)
-            .select("*")
-            .ilike("Type", f"%{cleaned_type}%")
-            .limit(limit)
+        pool = await get_pool()
+        conditions = ['"Type" ILIKE $1']
+        args: List[Any] = [f"%{cleaned_type}%"]
+        
+        # Apply sorting and the position of the requested page
+        try:
+            order_clause = build_order_clause(apply_keyset(conditions, args, sort_order, cursor))
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        
+        args.append(limit)
+        sql = (
+            f'SELECT {MEDICINE_ROW_COLS} FROM "{MEDICINES_TABLE}"'
+            f'{build_where_clause(conditions)}{order_clause} LIMIT ${len(args)}'
         )
         
-        # Apply sorting if specified
-        if sort_order and sort_order != "none":
-            query = apply_price_sort(query, sort_order)
-            logger.info(f"Applied price sorting: {sort_order}")
+        rows = await pool.fetch(sql, *args)
         
-        logger.info("Executing type filter query...")
-        response = query.execute()
-        logger.info(f"Query executed successfully")
+        if format == "ndjson":
+            return StreamingResponse(
+                stream_medicines_ndjson(rows, limit, sort_order),
+                media_type="application/x-ndjson"
+            )
         
-        if not response.data:
-            logger.info(f"No medicines found for type: {repr(cleaned_type)}")
-            return []
+        if not rows:
+            logger.debug("No medicines found for type: %r", cleaned_type)
+            return RecordJSONResponse(content=[])
             
-        # Convert to Medicine objects
-        medicines = []
-        for item in response.data:
-            try:
-                medicine = create_medicine_from_db(item)
-                medicines.append(medicine)
-            except Exception as e:
-                logger.error(f"Error converting medicine data: {str(e)}")
-                logger.error(f"Problematic data: {item}")
-                continue
+        # Rows already use the Medicine aliases as keys, so serialize them
+        # directly instead of validating each one through Pydantic
+        medicines = [dict(row) for row in rows]
         
-        logger.info(f"Found {len(medicines)} medicines for type: {repr(cleaned_type)}")
-        return medicines
+        # A full page means there may be more results
+        headers = {}
+        if len(medicines) == limit:
+            headers["X-Next-Cursor"] = encode_cursor(medicines[-1], sort_order)
         
+        logger.debug("Found %d medicines for type: %r", len(medicines), cleaned_type)
+        return RecordJSONResponse(content=medicines, headers=headers)
+        
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error("=== Error in Type Filter ===")
         logger.error(f"Error details: {str(e)}")
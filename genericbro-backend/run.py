@@ -1,14 +1,12 @@
+import os
 import uvicorn
-import logging
 from main import app  
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
-
 if __name__ == "__main__":
+    # Show INFO logs when running locally; the reloader's worker process
+    # picks this up when it imports main
+    os.environ.setdefault("LOG_LEVEL", "INFO")
+
     # Run the server
     uvicorn.run(
         "main:app",
@@ -16,4 +14,4 @@ if __name__ == "__main__":
         port=8000,
         reload=True,  # Enable auto-reload
         log_level="info"
-    ) 
\ No newline at end of file
+    )